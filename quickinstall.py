@@ -36,22 +36,26 @@ Usage (to display a menu of commands):
 
 from __future__ import annotations
 
-from typing import Any, ClassVar
+from typing import Any, ClassVar, TextIO
 
 import argparse
-import fnmatch
-import glob
+import contextlib
 import os
 import os.path
+import functools
 import platform
+import re
+import shlex
 import subprocess
 import sys
 import shutil
 import timeit
+import traceback
 import venv
 
 from abc import ABC, abstractmethod
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
 MIN_PYTHON_VERSION = (3, 10)
 
@@ -70,10 +74,18 @@ DUMPHTML = "m-dump-html.txt"
 EXTRAS = "m-extras.txt"
 DIST = "m-create-dist.txt"
 
+# buffer size for log files capturing high volume subprocess output,
+# large enough to collapse many small child writes into few syscalls
+LOG_BUFFERING = 1 << 16
+
 # default files used for backup and restore
 BACKUP_FILENAME = os.path.normpath("wiki/backup.moin")
 JUST_IN_CASE_BACKUP = os.path.normpath("wiki/deleted-backup.moin")
 
+# rolled backup generations, newest first; splitext keeps dots elsewhere in the path intact
+_stem, _ext = os.path.splitext(BACKUP_FILENAME)
+BACKUP_ROLLED = tuple(f"{_stem}{i}{_ext}" for i in (1, 2, 3))
+
 
 if sys.version_info < MIN_PYTHON_VERSION:
     sys.exit(
@@ -84,12 +96,10 @@ if sys.version_info < MIN_PYTHON_VERSION:
 
 if os.name == "nt":
     M = "m"  # customize help to local OS
-    SEP = " & "
     WINDOWS_OS = True
     ACTIVATE = "activate"
 else:
     M = "./m"
-    SEP = ";"
     WINDOWS_OS = False
     ACTIVATE = ". activate"
 
@@ -151,9 +161,12 @@ def mkdir(at_path: str) -> None:
         os.makedirs(at_path)
 
 
+@functools.lru_cache(maxsize=None)
 def path_locations(home_dir: str, dry_run: bool = False) -> tuple[str, str, str, str]:
     """
     Return the path locations for the environment (where libraries are, where scripts go, etc).
+
+    The result is deterministic for a given home_dir and interpreter, so it is cached.
     """
     home_dir = os.path.abspath(home_dir)
     lib_dir, inc_dir, bin_dir = None, None, None
@@ -197,111 +210,129 @@ def path_locations(home_dir: str, dry_run: bool = False) -> tuple[str, str, str,
     return home_dir, lib_dir, inc_dir, bin_dir
 
 
+@functools.lru_cache(maxsize=None)
+def phrase_pattern(phrases: tuple[str, ...]) -> re.Pattern:
+    """
+    Compile a case-insensitive alternation matching any of the given phrases.
+    """
+    return re.compile("|".join(re.escape(phrase) for phrase in phrases), re.IGNORECASE)
+
+
+# key phrases to search for in each log file
+FILES_PHRASES = {
+    # filename: (list of phrases)
+    # Note: phrases must be lower-case
+    QUICKINSTALL: (
+        "could not find",
+        "error",
+        "fail",
+        "timeout",
+        "traceback",
+        "success",
+        "cache location",
+        "must be deactivated",
+        "no such option",
+    ),
+    NEWWIKI: ("error", "fail", "timeout", "traceback", "success"),
+    BACKUPWIKI: ("error", "fail", "timeout", "traceback", "success"),
+    DUMPHTML: ("fail", "timeout", "traceback", "success", "cannot", "denied", "error"),
+    # use of 'error ' below is to avoid matching .../Modules/errors.o....
+    EXTRAS: (
+        "error ",
+        "error:",
+        "error.",
+        "error,",
+        "fail",
+        "timeout",
+        "traceback",
+        "active version",
+        "successfully installed",
+        "finished",
+    ),
+    # ': e' matches lines similar to:
+    # src/moin/converters\_tests\test_moinwiki_in_out.py:294:5: E303 too many blank lines (3)
+    TOX: ("seconds =", "internalerror", "error:", "traceback", ": e", ": f", " passed, "),
+    CODING_STD: ("remove trailing blanks", "dos line endings", "unix line endings", "remove empty lines"),
+    DIST: ("creating", "copying", "adding", "hard linking"),
+    DOCS: (
+        "build finished",
+        "build succeeded",
+        "traceback",
+        "failed",
+        "error",
+        "usage",
+        "importerror",
+        "exception occurred",
+    ),
+}
+IGNORE_PHRASES = {TOX: ("interpreternotfound",)}
+# For these file names, display a count of occurrences rather than each found line
+PRINT_COUNTS = (CODING_STD, DIST)
+
+# one case-insensitive alternation per log file, compiled once at import
+FILES_PATTERNS = {name: phrase_pattern(phrases) for name, phrases in FILES_PHRASES.items()}
+IGNORE_PATTERNS = {name: phrase_pattern(phrases) for name, phrases in IGNORE_PHRASES.items()}
+
+
 def search_for_phrase(filename: str) -> None:
     """
     Search a text file for key phrases and print the lines of interest or print a count by phrase.
     """
-    files = {
-        # filename: (list of phrases)
-        # Note: phrases must be lower-case
-        QUICKINSTALL: (
-            "could not find",
-            "error",
-            "fail",
-            "timeout",
-            "traceback",
-            "success",
-            "cache location",
-            "must be deactivated",
-            "no such option",
-        ),
-        NEWWIKI: ("error", "fail", "timeout", "traceback", "success"),
-        BACKUPWIKI: ("error", "fail", "timeout", "traceback", "success"),
-        DUMPHTML: ("fail", "timeout", "traceback", "success", "cannot", "denied", "error"),
-        # use of 'error ' below is to avoid matching .../Modules/errors.o....
-        EXTRAS: (
-            "error ",
-            "error:",
-            "error.",
-            "error,",
-            "fail",
-            "timeout",
-            "traceback",
-            "active version",
-            "successfully installed",
-            "finished",
-        ),
-        # ': e' matches lines similar to:
-        # src/moin/converters\_tests\test_moinwiki_in_out.py:294:5: E303 too many blank lines (3)
-        TOX: ("seconds =", "internalerror", "error:", "traceback", ": e", ": f", " passed, "),
-        CODING_STD: ("remove trailing blanks", "dos line endings", "unix line endings", "remove empty lines"),
-        DIST: ("creating", "copying", "adding", "hard linking"),
-        DOCS: (
-            "build finished",
-            "build succeeded",
-            "traceback",
-            "failed",
-            "error",
-            "usage",
-            "importerror",
-            "exception occurred",
-        ),
-    }
-    ignore_phrases = {TOX: ("interpreternotfound",)}
-    # For these file names, display a count of occurrences rather than each found line
-    print_counts = (CODING_STD, DIST)
-
-    with open(filename) as f:
-        lines = f.readlines()
     name = os.path.split(filename)[1]
-    phrases = files[name]
-    ignore_phrase = ignore_phrases[name] if name in ignore_phrases else ()
+    # one pass per line matches all phrases simultaneously
+    pattern = FILES_PATTERNS[name]
+    ignore_pattern = IGNORE_PATTERNS.get(name)
     counts = Counter()
-    for idx, line in enumerate(lines):
-        for phrase in phrases:
-            if phrase in line.lower():
-                if filename in print_counts:
-                    counts[phrase] += 1
-                else:
-                    skip = False
-                    for ignore in ignore_phrase:
-                        if ignore in line.lower():
-                            skip = True
-                            break
-                    if not skip:
-                        print(idx + 1, line.rstrip())
-                    break
+    hits = []
+    # stream line by line, logs like m-tox.txt may be tens of MB
+    with open(filename, buffering=LOG_BUFFERING) as f:
+        for idx, line in enumerate(f, start=1):
+            if pattern.search(line):
+                if filename in PRINT_COUNTS:
+                    counts.update(phrase.lower() for phrase in pattern.findall(line))
+                elif not (ignore_pattern and ignore_pattern.search(line)):
+                    hits.append(f"{idx} {line.rstrip()}\n")
+    # a single write is much cheaper than one print per matched line
     for key in counts:
-        print(f'The phrase "{key}" was found {counts[key]} times.')
+        hits.append(f'The phrase "{key}" was found {counts[key]} times.\n')
+    sys.stdout.write("".join(hits))
 
 
 def wiki_exists() -> bool:
     """
     Return True if a wiki exists.
     """
-    return bool(glob.glob("wiki/index/_all_revs_*.toc"))
+    try:
+        with os.scandir("wiki/index") as entries:
+            return any(entry.name.startswith("_all_revs_") and entry.name.endswith(".toc") for entry in entries)
+    except FileNotFoundError:
+        return False
 
 
 def copy_config_files() -> None:
+    # copyfile skips the permission-copying syscalls of shutil.copy
     if not os.path.isfile("wikiconfig.py"):
-        shutil.copy("src/moin/config/wikiconfig.py", "wikiconfig.py")
+        shutil.copyfile("src/moin/config/wikiconfig.py", "wikiconfig.py")
     if not os.path.isfile("intermap.txt"):
-        shutil.copy("src/moin/config/intermap.txt", "intermap.txt")
-    if not os.path.isdir("wiki_local"):
-        os.mkdir("wiki_local")
+        shutil.copyfile("src/moin/config/intermap.txt", "intermap.txt")
+    os.makedirs("wiki_local", exist_ok=True)
 
 
-def make_wiki(command: str, mode: str = "w", msg: str = "\nSuccess: a new wiki has been created.") -> None:
+def make_wiki(commands: list[list[str]], mode: str = "w", msg: str = "\nSuccess: a new wiki has been created.") -> None:
     """
-    Process command to create a new wiki.
+    Process a sequence of commands to create a new wiki.
     """
     if wiki_exists() and mode == "w":
         print("Error: a wiki exists, delete it and try again.")
     else:
         copy_config_files()
         print(f"Output messages redirected to {NEWWIKI}.")
-        with open(NEWWIKI, mode) as messages:
-            result = subprocess.call(command, shell=True, stderr=messages, stdout=messages)
+        with open(NEWWIKI, mode, buffering=LOG_BUFFERING) as messages:
+            result = 0
+            for command in commands:
+                result = subprocess.call(command, stderr=messages, stdout=messages)
+                if result != 0:
+                    break
         if result == 0:
             print(msg)
         else:
@@ -310,18 +341,50 @@ def make_wiki(command: str, mode: str = "w", msg: str = "\nSuccess: a new wiki h
             print(f'\nError: attempt to create wiki failed. Do "{M} log new-wiki" to see complete log.')
 
 
+def walk_files(root: str):
+    """
+    Yield a DirEntry for every file below root.
+
+    DirEntry carries the file type information from the directory scan,
+    avoiding the extra stat() per entry that os.walk incurs.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
 def delete_files(pattern) -> None:
     """
-    Recursively delete all files matching pattern.
+    Recursively delete all files matching a `*.<ext>` pattern.
     """
+    suffix = pattern.removeprefix("*")
     matches = 0
-    for root, dirnames, filenames in os.walk(os.path.abspath(os.path.dirname(__file__))):
-        for filename in fnmatch.filter(filenames, pattern):
-            os.remove(os.path.join(root, filename))
+    for entry in walk_files(os.path.abspath(os.path.dirname(__file__))):
+        if entry.name.endswith(suffix):
+            os.unlink(entry.path)
             matches += 1
     print(f'Deleted {matches} files matching "{pattern}".')
 
 
+def delete_files_multi(patterns: tuple[str, ...]) -> None:
+    """
+    Recursively delete all files matching any of several `*.<ext>` patterns in a single tree walk.
+    """
+    suffixes = tuple(pattern.removeprefix("*") for pattern in patterns)
+    matches = Counter()
+    for entry in walk_files(os.path.abspath(os.path.dirname(__file__))):
+        if entry.name.endswith(suffixes):
+            os.unlink(entry.path)
+            matches[os.path.splitext(entry.name)[1]] += 1
+    for pattern, suffix in zip(patterns, suffixes):
+        print(f'Deleted {matches[suffix]} files matching "{pattern}".')
+
+
 def create_m() -> None:
     """
     Create an 'm.bat or 'm' bash script that will run quickinstall.py using this Python.
@@ -363,25 +426,29 @@ class QuickInstall(Command):
 
     key = "quickinstall"
 
-    def run_shell_command(self, command: str, append: bool = False) -> None:
-        with open(QUICKINSTALL, "a" if append else "w") as messages:
+    def run_logged_command(self, command: list[str], append: bool = False) -> None:
+        with open(QUICKINSTALL, "a" if append else "w", buffering=LOG_BUFFERING) as messages:
             # we run ourself as a subprocess so output can be captured in a log file
-            subprocess.run(command, shell=True, stderr=messages, stdout=messages)
+            subprocess.run(command, stderr=messages, stdout=messages)
 
     def execute(self) -> None:
 
         source = os.path.dirname(os.path.realpath(sys.argv[0]))
-        command = f"{sys.executable} {sys.argv[0]} createvenv --source {source}"
-        if self.args.venv:
-            command += f" --name {self.args.venv}"
-        print(f"Running {sys.argv[0]}... output messages redirected to {QUICKINSTALL}")
-        self.run_shell_command(command)
+        args = argparse.Namespace(source=source, name=self.args.venv or ".venv")
+        print(f"Creating or updating the venv... output messages redirected to {QUICKINSTALL}")
+        # run createvenv in-process instead of re-exec'ing quickinstall.py, saving an
+        # interpreter start; its child processes write to the same log file
+        with open(QUICKINSTALL, "w", buffering=LOG_BUFFERING) as messages:
+            with contextlib.redirect_stdout(messages), contextlib.redirect_stderr(messages):
+                try:
+                    CreateVirtualEnv(args, [], log=messages).execute()
+                except Exception:
+                    traceback.print_exc(file=messages)
 
         if os.path.isdir(".tox"):
             # keep tox test virtualenvs in sync with moin-env-python
-            command = "tox --recreate --notest"
             print(f"Running tox recreate virtualenvs... output messages redirected to {QUICKINSTALL}")
-            self.run_shell_command(command, append=True)
+            self.run_logged_command(["tox", "--recreate", "--notest"], append=True)
 
         copy_config_files()
 
@@ -400,9 +467,11 @@ class CreateVirtualEnv(Command):
 
     key = "createvenv"
 
-    def __init__(self, args: argparse.Namespace, additional: list[str]) -> None:
+    def __init__(self, args: argparse.Namespace, additional: list[str], log: TextIO | None = None) -> None:
         super().__init__(args, additional)
         self.dir_source = args.source
+        # child processes write to log when run in-process by QuickInstall, else inherit our streams
+        self.log = log
         venv_path = self._get_venv_path(args.source, args.name)
         venv_home, venv_lib, venv_inc, venv_bin = path_locations(venv_path)
         self.dir_venv = venv_home
@@ -425,30 +494,48 @@ class CreateVirtualEnv(Command):
         sys.stdout.write(f"\n\nSuccessfully created or updated venv at {self.dir_venv}\n")
 
     def do_venv(self) -> None:
-        venv.create(self.dir_venv, system_site_packages=False, clear=False, symlinks=False, with_pip=True, prompt=None)
+        pip = "pip.exe" if WINDOWS_OS else "pip"
+        # skip the multi-second ensurepip bootstrap when the venv already has a pip executable
+        with_pip = not (
+            os.path.isfile(os.path.join(self.dir_venv, "pyvenv.cfg"))
+            and os.path.exists(os.path.join(self.dir_venv_bin, pip))
+        )
+        venv.create(
+            self.dir_venv, system_site_packages=False, clear=False, symlinks=False, with_pip=with_pip, prompt=None
+        )
 
     def do_install(self) -> None:
         args = [
             os.path.join(self.dir_venv_bin, "pip"),
             "install",
+            "--disable-pip-version-check",
             "--upgrade",
             "--upgrade-strategy=eager",
             "--editable",
             self.dir_source,
         ]
-        subprocess.check_call(args)
+        subprocess.check_call(args, stdout=self.log, stderr=self.log)
 
     def do_catalog(self) -> None:
-        subprocess.check_call(
-            (
-                os.path.join(self.dir_venv_bin, "pybabel"),
-                "compile",
-                "--statistics",
-                # needed in case user runs quickinstall.py with a cwd other than the repo root
-                "--directory",
-                os.path.join(os.path.dirname(__file__), "src", "moin", "translations"),
+        pybabel = os.path.join(self.dir_venv_bin, "pybabel")
+        # needed in case user runs quickinstall.py with a cwd other than the repo root
+        translations = os.path.join(os.path.dirname(__file__), "src", "moin", "translations")
+        with os.scandir(translations) as entries:
+            locales = [entry.name for entry in entries if entry.is_dir(follow_symlinks=False)]
+        if len(locales) < 2:
+            subprocess.check_call(
+                (pybabel, "compile", "--statistics", "--directory", translations), stdout=self.log, stderr=self.log
             )
-        )
+            return
+        # each locale's .po -> .mo compilation is independent, run them concurrently
+        commands = [
+            (pybabel, "compile", "--statistics", "--directory", translations, "--locale", locale) for locale in locales
+        ]
+        run = functools.partial(subprocess.run, stdout=self.log, stderr=self.log)
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for result in executor.map(run, commands):
+                if result.returncode:
+                    raise subprocess.CalledProcessError(result.returncode, result.args)
 
     def create_wrapper(self, filename, target) -> None:
         """
@@ -482,10 +569,14 @@ class GenerateDocs(Command):
     key = "docs"
 
     def execute(self) -> None:
-        command = "sphinx-apidoc -f -o docs/devel/api src/moin {0}cd docs{0} make html".format(SEP)
         print(f"Creating HTML docs... output messages written to {DOCS}.")
-        with open(DOCS, "w") as messages:
-            result = subprocess.call(command, shell=True, stderr=messages, stdout=messages)
+        with open(DOCS, "w", buffering=LOG_BUFFERING) as messages:
+            result = subprocess.call(
+                ["sphinx-apidoc", "-f", "-o", "docs/devel/api", "src/moin"], stderr=messages, stdout=messages
+            )
+            if result == 0:
+                make = "make.bat" if WINDOWS_OS else "make"
+                result = subprocess.call([make, "html"], cwd="docs", stderr=messages, stdout=messages)
         print(f"\nSearching {DOCS}, important messages are shown below...\n")
         search_for_phrase(DOCS)
         if result == 0:
@@ -510,12 +601,14 @@ class InstallExtras(Command):
         reqs = ["requirements.d/extras.txt", "requirements.d/development.txt", "docs/requirements.txt"]
         if not WINDOWS_OS:
             reqs.append("requirements.d/ldap.txt")
-        reqs_installer = "pip install --upgrade -r "
-        command = SEP.join(list(reqs_installer + x for x in reqs))
+        # one pip invocation resolves all requirements files together
+        command = ["pip", "install", "--upgrade", "--disable-pip-version-check"]
+        for req in reqs:
+            command += ["-r", req]
         print("Installing {}.".format(", ".join(reqs)))
         print(f"Output messages written to {EXTRAS}.")
-        with open(EXTRAS, "w") as messages:
-            subprocess.call(command, shell=True, stderr=messages, stdout=messages)
+        with open(EXTRAS, "w", buffering=LOG_BUFFERING) as messages:
+            subprocess.call(command, stderr=messages, stdout=messages)
         print('\nImportant messages from {} are shown below. Do "{} log extras" to see complete log.'.format(EXTRAS, M))
         search_for_phrase(EXTRAS)
         self.run_time()
@@ -533,8 +626,7 @@ class RefreshInterwiki(Command):
     def execute(self) -> None:
         intermap_path = os.path.abspath("intermap.txt")
         print(f"Refreshing {intermap_path}...")
-        command = f"{sys.executable} scripts/wget.py {self.intermap_uri} {intermap_path}"
-        subprocess.run(command, shell=True, check=True)
+        subprocess.run([sys.executable, "scripts/wget.py", self.intermap_uri, intermap_path], check=True)
 
 
 class ViewLogFile(Command):
@@ -549,11 +641,10 @@ class ViewLogFile(Command):
         logs = set(CMD_LOGS.keys())
         if self.args.target and self.args.target in logs and os.path.isfile(CMD_LOGS[self.args.target]):
             if WINDOWS_OS:
-                command = f"start {CMD_LOGS[self.args.target]}"
+                os.startfile(CMD_LOGS[self.args.target])
             else:
-                # .format requires {{ and }} to escape { and }
-                command = f"${{VISUAL:-${{FCEDIT:-${{EDITOR:-less}}}}}} {CMD_LOGS[self.args.target]}"
-            subprocess.call(command, shell=True)
+                editor = os.environ.get("VISUAL") or os.environ.get("FCEDIT") or os.environ.get("EDITOR") or "less"
+                subprocess.call(shlex.split(editor) + [CMD_LOGS[self.args.target]])
         else:
             self.print_help()
 
@@ -581,8 +672,7 @@ class CreateNewWiki(Command):
 
     def execute(self) -> None:
         print("Creating a new empty wiki...")
-        command = "moin index-create"
-        make_wiki(command)  # share code with restore command
+        make_wiki([["moin", "index-create"]])  # share code with restore command
 
 
 class Import19(Command):
@@ -611,18 +701,19 @@ class Backup(Command):
                 print(f"Creating a wiki backup to {filename}...")
             else:
                 print(f"Creating a wiki backup to {filename} after rolling 3 prior backups...")
-                b3 = BACKUP_FILENAME.replace(".", "3.")
-                b2 = BACKUP_FILENAME.replace(".", "2.")
-                b1 = BACKUP_FILENAME.replace(".", "1.")
-                if os.path.exists(b3):
+                b1, b2, b3 = BACKUP_ROLLED
+                # one directory scan instead of a stat() per backup generation
+                with os.scandir("wiki") as entries:
+                    existing = {entry.name for entry in entries}
+                if os.path.basename(b3) in existing:
                     os.remove(b3)
                 for src, dst in ((b2, b3), (b1, b2), (BACKUP_FILENAME, b1)):
-                    if os.path.exists(src):
-                        os.rename(src, dst)
+                    if os.path.basename(src) in existing:
+                        os.replace(src, dst)
 
-            command = f"moin save --all-backends --file {filename}"
-            with open(BACKUPWIKI, "w") as messages:
-                result = subprocess.call(command, shell=True, stderr=messages, stdout=messages)
+            command = ["moin", "save", "--all-backends", "--file", filename]
+            with open(BACKUPWIKI, "w", buffering=LOG_BUFFERING) as messages:
+                result = subprocess.call(command, stderr=messages, stdout=messages)
             if result == 0:
                 print(f"Success: wiki was backed up to {filename}")
             else:
@@ -646,14 +737,13 @@ class Restore(Command):
     key = "restore"
 
     def execute(self) -> None:
-        command = "moin index-create{0} moin load --file %s{0} moin index-build".format(SEP)
         filename = BACKUP_FILENAME
         if self.args.filename:
             filename = self.args.filename
         if os.path.isfile(filename):
-            command = command % filename
+            commands = [["moin", "index-create"], ["moin", "load", "--file", filename], ["moin", "index-build"]]
             print(f"Creating a new wiki and loading it with data from {filename}...")
-            make_wiki(command)
+            make_wiki(commands)
         else:
             print(f"Error: cannot create wiki because {filename} does not exist.")
         self.run_time()
@@ -669,9 +759,9 @@ class HtmlDump(Command):
     def execute(self) -> None:
         if wiki_exists():
             print("Creating static HTML image of wiki...")
-            command = "moin dump-html {}".format(" ".join(self.additional))
-            with open(DUMPHTML, "w") as messages:
-                result = subprocess.call(command, shell=True, stderr=messages, stdout=messages)
+            command = ["moin", "dump-html"] + self.additional
+            with open(DUMPHTML, "w", buffering=LOG_BUFFERING) as messages:
+                result = subprocess.call(command, stderr=messages, stdout=messages)
             if result == 0:
                 print("Success: wiki was dumped to html files")
             else:
@@ -698,9 +788,14 @@ class RunSass(Command):
     def execute(self) -> None:
         print("Running sass to update Basic theme CSS files. This requires Node.js and NPM to be installed locally.")
         build_css_dir = os.path.join("contrib", "css-build")
-        command = f"cd {build_css_dir}{SEP}npm install{SEP}npm run build"
-        print(f"running command: {command}")
-        result = subprocess.call(command, shell=True)
+        result = 0
+        # on Windows npm is npm.cmd, which CreateProcess does not resolve
+        npm = "npm.cmd" if WINDOWS_OS else "npm"
+        for command in ([npm, "install"], [npm, "run", "build"]):
+            print(f"running command: {' '.join(command)} in {build_css_dir}")
+            result = subprocess.call(command, cwd=build_css_dir)
+            if result != 0:
+                break
         if result == 0:
             print("Success: Basic theme CSS files updated.")
         else:
@@ -716,9 +811,10 @@ class RunTests(Command):
 
     def execute(self) -> None:
         print(f"Running tests... output written to {TOX}.")
-        command = "tox -- {1} > {0} 2>&1".format(TOX, " ".join(self.additional))
-        print(f"Test command line: {command}")
-        subprocess.call(command, shell=True)
+        command = ["tox", "--"] + self.additional
+        print(f"Test command line: {' '.join(command)}")
+        with open(TOX, "w", buffering=LOG_BUFFERING) as messages:
+            subprocess.call(command, stdout=messages, stderr=subprocess.STDOUT)
         print(f'Important messages from {TOX} are shown below. Do "{M} log tests" to see complete log.')
         search_for_phrase(TOX)
         self.run_time()
@@ -733,8 +829,7 @@ class CheckCodingStandard(Command):
 
     def execute(self) -> None:
         print("Checking for trailing blanks, DOS line endings, Unix line endings, empty lines at eof...")
-        command = f"{sys.executable} scripts/coding_std.py"
-        subprocess.call(command, shell=True)
+        subprocess.call([sys.executable, "scripts/coding_std.py"])
 
 
 # not on menu, rarely used, similar code was in moin 1.9
@@ -748,9 +843,13 @@ class CreateDist(Command):
     def execute(self) -> None:
         print("Deleting wiki data, then creating distribution archive in /dist, output written to {}.".format(DIST))
         DeleteWiki().execute()
-        command = "pip install build ; python -m build"
-        with open(DIST, "w") as messages:
-            result = subprocess.call(command, shell=True, stderr=messages, stdout=messages)
+        commands = [[sys.executable, "-m", "pip", "install", "build"], [sys.executable, "-m", "build"]]
+        with open(DIST, "w", buffering=LOG_BUFFERING) as messages:
+            result = 0
+            for command in commands:
+                result = subprocess.call(command, stderr=messages, stdout=messages)
+                if result != 0:
+                    break
         print(f"Summary message from {DIST} is shown below:")
         search_for_phrase(DIST)
         if result == 0:
@@ -804,21 +903,21 @@ class DeleteWiki(Command):
     key = "del-wiki"
 
     def execute(self) -> None:
-        command = f"moin save --all-backends --file {JUST_IN_CASE_BACKUP}"
+        command = ["moin", "save", "--all-backends", "--file", JUST_IN_CASE_BACKUP]
         if wiki_exists():
             print(f"Creating a backup named {JUST_IN_CASE_BACKUP}; then deleting all wiki data and indexes...")
-            with open(DELWIKI, "w") as messages:
-                result = subprocess.call(command, shell=True, stderr=messages, stdout=messages)
+            with open(DELWIKI, "w", buffering=LOG_BUFFERING) as messages:
+                result = subprocess.call(command, stderr=messages, stdout=messages)
             if result != 0:
                 print(f"Error: backup failed with return code = {result}. Complete log is in {DELWIKI}.")
         # destroy wiki even if backup fails
         if os.path.isdir("wiki/data") or os.path.isdir("wiki/index"):
-            shutil.rmtree("wiki/data")
-            shutil.rmtree("wiki/index")
-            if os.path.isdir("wiki/preview"):
-                shutil.rmtree("wiki/preview")
-            if os.path.isdir("wiki/sql"):
-                shutil.rmtree("wiki/sql")
+            subtrees = ("wiki/data", "wiki/index", "wiki/preview", "wiki/sql")
+            # rmtree with ignore_errors no-ops on missing subtrees, no per-subtree isdir needed;
+            # deletion is syscall bound and syscalls release the GIL, so overlap the subtrees
+            rmtree = functools.partial(shutil.rmtree, ignore_errors=True)
+            with ThreadPoolExecutor(max_workers=len(subtrees)) as executor:
+                list(executor.map(rmtree, subtrees))
             print("Wiki data successfully deleted.")
         else:
             print("Wiki data not deleted because it does not exist.")
@@ -833,36 +932,38 @@ class DeleteAll(Command):
     key = "del-all"
 
     def execute(self) -> None:
-        DeleteOrigFiles().execute()
-        DeletePycFiles().execute()
-        DeleteRejectedFiles().execute()
+        # one tree walk instead of three
+        delete_files_multi(("*.orig", "*.pyc", "*.rej"))
         DeleteWiki().execute()
 
 
-COMMANDS: list[type[Command]] = [
-    QuickInstall,
-    CreateVirtualEnv,
-    GenerateDocs,
-    InstallExtras,
-    RefreshInterwiki,
-    ViewLogFile,
-    CreateNewWiki,
-    Import19,
-    Backup,
-    Restore,
-    HtmlDump,
-    RunSass,
-    RunTests,
-    CheckCodingStandard,
-    CreateDist,
-    DeleteAll,
-    DeleteOrigFiles,
-    DeletePycFiles,
-    DeleteRejectedFiles,
-    DeleteWiki,
-]
+COMMANDS: dict[str, type[Command]] = {
+    command.key: command
+    for command in (
+        QuickInstall,
+        CreateVirtualEnv,
+        GenerateDocs,
+        InstallExtras,
+        RefreshInterwiki,
+        ViewLogFile,
+        CreateNewWiki,
+        Import19,
+        Backup,
+        Restore,
+        HtmlDump,
+        RunSass,
+        RunTests,
+        CheckCodingStandard,
+        CreateDist,
+        DeleteAll,
+        DeleteOrigFiles,
+        DeletePycFiles,
+        DeleteRejectedFiles,
+        DeleteWiki,
+    )
+}
 """
-Each cmd_ method processes a choice on the menu.
+Maps each menu choice to the Command subclass that processes it.
 """
 
 
@@ -965,7 +1066,7 @@ def main() -> None:
         usage()
         sys.exit(1)
 
-    command = next((cmd for cmd in COMMANDS if cmd.key == args.command), None)
+    command = COMMANDS.get(args.command)
     assert command
     print(f"command = {command} args = {args!r}")
 